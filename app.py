@@ -39,16 +39,28 @@ with st.sidebar:
 # Main area
 st.markdown("---")
 
+
+# Cached resources - loaded once per process and shared across all sessions,
+# so the Chroma/HNSW index and LLM HTTP clients are never rebuilt on reruns
+@st.cache_resource(show_spinner="Loading database...")
+def get_manager():
+    return initialize_database()
+
+
+@st.cache_resource
+def get_searcher(_manager):
+    return create_searcher(_manager)
+
+
+@st.cache_resource
+def get_llm_processor():
+    return create_llm_processor()
+
+
 # Try to load database
 try:
-    if 'manager' not in st.session_state:
-        with st.spinner("Loading database..."):
-            manager = initialize_database()
-            st.session_state['manager'] = manager
-            st.success("✅ Database loaded successfully!")
-    else:
-        manager = st.session_state['manager']
-        
+    manager = get_manager()
+
 except Exception as e:
     st.error("⚠️ Database not found!")
     st.warning("Please build the database first by running:")
@@ -60,104 +72,141 @@ except Exception as e:
 st.subheader("📝 Enter Blog Post URL")
 
 # Create searcher and LLM processor
-searcher = create_searcher(manager)
-llm_processor = create_llm_processor()
+searcher = get_searcher(manager)
+llm_processor = get_llm_processor()
+
 
-# Get all available URLs
-all_urls = searcher.get_all_urls()
+# Search results are deterministic given (url, database state), so cache them
+# across reruns; db_version (the collection count) invalidates on re-ingest
+@st.cache_data(show_spinner=False)
+def cached_find_similar(url: str, db_version: int):
+    return searcher.find_similar_posts(url)
+
+
+@st.cache_data(show_spinner=False)
+def cached_post_context(url: str, db_version: int):
+    return searcher.get_post_context(url)
+
+
+@st.cache_data(show_spinner=False)
+def get_urls(db_version: int):
+    return searcher.get_all_urls()
+
+
+db_version = manager.vectorstore._collection.count()
+
+# Get all available URLs (cached; invalidates when the collection changes)
+all_urls = get_urls(db_version)
+url_set = frozenset(all_urls)
 
 if all_urls:
     st.caption(f"Database contains {len(all_urls)} blog posts")
 
-# URL input
-url_input = st.text_input(
-    "Blog Post URL:",
-    placeholder="https://prostructengineering.com/your-blog-post",
-    help="Enter the URL of the blog post you want to find internal links for"
-)
 
-# Search button
-if st.button("🔍 Find Similar Posts", type="primary"):
-    if not url_input:
-        st.error("⚠️ Please enter a URL")
-    elif url_input not in all_urls:
-        st.error("❌ URL not found in database")
-        st.info("💡 Make sure the URL is from your sitemap and the database is up to date")
-        
-        with st.expander("Show available URLs (first 10)"):
-            for url in all_urls[:10]:
-                st.text(url)
-            if len(all_urls) > 10:
-                st.caption(f"...and {len(all_urls) - 10} more")
-    else:
-        # Show spinner while processing
-        with st.spinner("🔍 Searching for similar posts..."):
-            similar_posts = searcher.find_similar_posts(url_input)
-            
-            if not similar_posts:
-                st.warning("No similar posts found above the similarity threshold.")
-                st.info(f"💡 Try lowering MIN_SIMILARITY_THRESHOLD in config.py (currently {manager.vectorstore._collection.metadata})")
-            else:
-                # Get target post info
-                target_context = searcher.get_post_context(url_input)
-                target_title = None
-                for metadata in manager.vectorstore.get()['metadatas']:
-                    if metadata.get('url') == url_input:
-                        target_title = metadata.get('title')
-                        break
-                
-                target_post = {
-                    'title': target_title or url_input,
-                    'content': target_context or ''
-                }
-                
-                # Generate reasons and anchor text
-                with st.spinner("🤖 Generating reasons and anchor text with GPT-4o..."):
-                    enhanced_results = llm_processor.process_all_suggestions(
-                        target_post,
-                        similar_posts
+# The whole search workflow lives in a fragment: interacting with its widgets
+# (search button, expanders, download button) reruns only this block instead
+# of the entire script
+@st.fragment
+def search_panel():
+    # URL input
+    url_input = st.text_input(
+        "Blog Post URL:",
+        placeholder="https://prostructengineering.com/your-blog-post",
+        help="Enter the URL of the blog post you want to find internal links for"
+    )
+
+    # Search button
+    if st.button("🔍 Find Similar Posts", type="primary"):
+        if not url_input:
+            st.error("⚠️ Please enter a URL")
+        elif url_input not in url_set:
+            st.error("❌ URL not found in database")
+            st.info("💡 Make sure the URL is from your sitemap and the database is up to date")
+
+            with st.expander("Show available URLs (first 10)"):
+                for url in all_urls[:10]:
+                    st.text(url)
+                if len(all_urls) > 10:
+                    st.caption(f"...and {len(all_urls) - 10} more")
+        else:
+            # Show spinner while processing
+            with st.spinner("🔍 Searching for similar posts..."):
+                similar_posts = cached_find_similar(url_input, db_version)
+
+                if not similar_posts:
+                    st.warning("No similar posts found above the similarity threshold.")
+                    st.info(f"💡 Try lowering MIN_SIMILARITY_THRESHOLD in config.py (currently {manager.vectorstore._collection.metadata})")
+                else:
+                    # Get target post info (metadata comes from the URL index -
+                    # no full-collection fetch)
+                    target_context = cached_post_context(url_input, db_version)
+                    target_metadata = manager.get_metadata(url_input) or {}
+                    target_title = target_metadata.get('title')
+
+                    target_post = {
+                        'url': url_input,
+                        'title': target_title or url_input,
+                        'content': target_context or ''
+                    }
+
+                    # Generate reasons and anchor text
+                    with st.spinner("🤖 Generating reasons and anchor text with GPT-4o..."):
+                        enhanced_results = llm_processor.process_all_suggestions(
+                            target_post,
+                            similar_posts
+                        )
+
+                    # Display results
+                    st.success(f"✅ Found {len(enhanced_results)} similar posts")
+                    st.markdown("---")
+
+                    # Show results
+                    for i, result in enumerate(enhanced_results, 1):
+                        with st.expander(f"#{i} - {result['title']}", expanded=(i==1)):
+                            col1, col2 = st.columns([2, 1])
+
+                            with col1:
+                                st.markdown(f"**URL:** [{result['url']}]({result['url']})")
+                                st.markdown(f"**Similarity Score:** {result['similarity']:.2%}")
+
+                            with col2:
+                                st.metric("Rank", f"#{i}")
+
+                            st.markdown("**Why Link These Posts:**")
+                            st.info(result['reason'])
+
+                            st.markdown("**Suggested Anchor Text:**")
+                            st.code(result['anchor_text'], language=None)
+
+                    # Download results as JSON
+                    st.markdown("---")
+
+                    download_data = [{
+                        "from_post": url_input,
+                        "to_post": r['url'],
+                        "reason": r['reason'],
+                        "anchor_text": r['anchor_text'],
+                        "similarity_score": f"{r['similarity']:.2%}"
+                    } for r in enhanced_results]
+
+                    # orjson serializes several times faster than stdlib json
+                    # and releases the GIL while doing it
+                    try:
+                        import orjson
+                        payload = orjson.dumps(download_data, option=orjson.OPT_INDENT_2)
+                    except ImportError:
+                        import json
+                        payload = json.dumps(download_data, indent=2)
+
+                    st.download_button(
+                        label="📥 Download Results (JSON)",
+                        data=payload,
+                        file_name="link_suggestions.json",
+                        mime="application/json"
                     )
-                
-                # Display results
-                st.success(f"✅ Found {len(enhanced_results)} similar posts")
-                st.markdown("---")
-                
-                # Show results
-                for i, result in enumerate(enhanced_results, 1):
-                    with st.expander(f"#{i} - {result['title']}", expanded=(i==1)):
-                        col1, col2 = st.columns([2, 1])
-                        
-                        with col1:
-                            st.markdown(f"**URL:** [{result['url']}]({result['url']})")
-                            st.markdown(f"**Similarity Score:** {result['similarity']:.2%}")
-                        
-                        with col2:
-                            st.metric("Rank", f"#{i}")
-                        
-                        st.markdown("**Why Link These Posts:**")
-                        st.info(result['reason'])
-                        
-                        st.markdown("**Suggested Anchor Text:**")
-                        st.code(result['anchor_text'], language=None)
-                
-                # Download results as JSON
-                st.markdown("---")
-                import json
-                
-                download_data = [{
-                    "from_post": url_input,
-                    "to_post": r['url'],
-                    "reason": r['reason'],
-                    "anchor_text": r['anchor_text'],
-                    "similarity_score": f"{r['similarity']:.2%}"
-                } for r in enhanced_results]
-                
-                st.download_button(
-                    label="📥 Download Results (JSON)",
-                    data=json.dumps(download_data, indent=2),
-                    file_name="link_suggestions.json",
-                    mime="application/json"
-                )
+
+
+search_panel()
 
 # Footer
 st.markdown("---")
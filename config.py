@@ -1,31 +1,47 @@
 import os
+import sys
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
 load_dotenv()
 
+
+def _get_secret(name):
+    """
+    Read a secret from Streamlit if it's running, else the environment.
+    Only consults streamlit when it's already loaded so that CLI entry
+    points (build_database.py) never pay the streamlit import cost.
+    """
+    st = sys.modules.get("streamlit")
+    if st is not None:
+        try:
+            return st.secrets.get(name, os.getenv(name))
+        except Exception:
+            pass
+    return os.getenv(name)
+
+
 class Config:
     """
     Central configuration class for the Link Suggestion Tool.
     All settings and constants are defined here.
     """
-    
+
     # API Configuration
     # Try Streamlit secrets first, fallback to environment variables
-    try:
-        import streamlit as st
-        OPENAI_API_KEY = st.secrets.get("OPENAI_API_KEY", os.getenv("OPENAI_API_KEY"))
-        GOOGLE_API_KEY = st.secrets.get("GOOGLE_API_KEY", os.getenv("GOOGLE_API_KEY"))
-    except:
-        OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-        GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
-    
+    OPENAI_API_KEY = _get_secret("OPENAI_API_KEY")
+    GOOGLE_API_KEY = _get_secret("GOOGLE_API_KEY")
+
     # Embedding Provider Selection
     USE_GOOGLE_EMBEDDINGS = True  # Set to False to use OpenAI embeddings
+    USE_LOCAL_EMBEDDINGS = False  # Overrides the above: embed locally, no API calls or cost
+    LOCAL_EMBEDDING_MODEL = "BAAI/bge-small-en-v1.5"  # Strong quality, light footprint
+    LOCAL_EMBEDDING_BATCH_SIZE = 64  # Texts per local encode batch
     
     # Model Settings
     EMBEDDING_MODEL = "models/text-embedding-004" if USE_GOOGLE_EMBEDDINGS else "text-embedding-3-small"
     LLM_MODEL = "gpt-4o"  # Most capable model for generating reasons and anchor text
+    LLM_REQUESTS_PER_MINUTE = 500  # Account tier RPM limit (smooths request submission client-side)
     
     # Sitemap URL
     SITEMAP_URL = "https://prostructengineering.com/post-sitemap.xml"
@@ -38,6 +54,8 @@ class Config:
     TOP_K_RESULTS = 10  # How many similar posts to retrieve initially
     FINAL_SUGGESTIONS = 5  # Show exactly 5 suggestions to the user
     MIN_SIMILARITY_THRESHOLD = 0.5  # Minimum similarity score (0-1 scale)
+    MMR_LAMBDA = 0.5  # MMR trade-off: 1.0 = pure relevance, 0.0 = pure diversity
+    QUANT_OVERSAMPLE = 4  # Quantized first pass keeps this many candidates per final result
     
     # Scraping Settings - Crawl4AI Configuration
     USE_CRAWL4AI = True  # Use Crawl4AI as primary scraper (fallback to BeautifulSoup if needed)
@@ -45,6 +63,9 @@ class Config:
     DELAY_BETWEEN_REQUESTS = 1  # Seconds to wait between scraping (be polite to servers)
     MAX_CONCURRENT_REQUESTS = 5  # How many pages to scrape at once (async)
     
+    # Debugging
+    VERBOSE = False  # Set to True for per-page scrape logging
+
     # Crawl4AI Specific Settings
     CRAWL4AI_VERBOSE = False  # Set to True for debugging
     CRAWL4AI_HEADLESS = True  # Run browser in headless mode (no UI)
@@ -52,6 +73,7 @@ class Config:
     
     # Content Extraction Settings
     MAX_CONTENT_LENGTH = 10000  # Maximum characters to extract from each post
+    EXCERPT_LENGTH = 300  # Characters of content stored as the LLM prompt excerpt
     EXTRACT_IMAGES = False  # Don't extract images (we only need text)
     EXTRACT_LINKS = False  # Don't need internal links during extraction
     
@@ -60,8 +82,10 @@ class Config:
     REMOVE_SIDEBAR = True  # Remove sidebar content
     REMOVE_ADS = True  # Remove advertisement sections
     
-    # LLM Prompt Templates
-    REASON_PROMPT_TEMPLATE = """
+    # LLM Prompt Template
+    # One call per post returns both the reason and the anchor text as JSON,
+    # halving request count and paying for the shared context only once
+    LINK_SUGGESTION_PROMPT_TEMPLATE = """
 You are an SEO expert analyzing blog post relationships for internal linking.
 
 Target Post Title: {target_title}
@@ -70,26 +94,22 @@ Target Post Excerpt: {target_excerpt}
 Similar Post Title: {similar_title}
 Similar Post Excerpt: {similar_excerpt}
 
-Write ONE concise sentence explaining why these posts should be linked together.
-Focus on the semantic relationship, topical overlap, and value to the reader.
-Keep it professional and informative.
-"""
-    
-    ANCHOR_TEXT_PROMPT_TEMPLATE = """
-You are a content strategist creating natural anchor text for internal blog links.
-
-Context from Target Post: {target_context}
-Post to Link To: {similar_title}
+Complete BOTH tasks below:
 
-Generate a natural, contextual anchor text phrase (3-7 words) for linking to the similar post.
+1. "reason": Write ONE concise sentence explaining why these posts should be
+   linked together. Focus on the semantic relationship, topical overlap, and
+   value to the reader. Keep it professional and informative.
 
-Requirements:
-- Must sound natural in a sentence
-- Should be descriptive and keyword-rich
-- Must relate to the similar post's topic
-- Avoid generic phrases like "click here", "read more", "this article"
+2. "anchor_text": Generate a natural, contextual anchor text phrase (3-7 words)
+   for linking to the similar post.
+   Requirements:
+   - Must sound natural in a sentence
+   - Should be descriptive and keyword-rich
+   - Must relate to the similar post's topic
+   - Avoid generic phrases like "click here", "read more", "this article"
 
-Return ONLY the anchor text phrase, nothing else.
+Respond with ONLY a JSON object in this exact format:
+{{"reason": "...", "anchor_text": "..."}}
 """
 
     # Cache Settings
@@ -103,7 +123,9 @@ Return ONLY the anchor text phrase, nothing else.
     SKIP_ON_ERROR = True  # Continue scraping even if some pages fail
 
 # Validate that required API keys exist
-if Config.USE_GOOGLE_EMBEDDINGS:
+if Config.USE_LOCAL_EMBEDDINGS:
+    pass  # Local embeddings need no API key
+elif Config.USE_GOOGLE_EMBEDDINGS:
     if not Config.GOOGLE_API_KEY:
         raise ValueError(
             "⚠️ Google API key not found! Please add GOOGLE_API_KEY to your .env file\n"
@@ -117,7 +139,7 @@ else:
         )
 
 print("✅ Configuration loaded successfully!")
-print(f"🔮 Embeddings: {'Google AI Studio' if Config.USE_GOOGLE_EMBEDDINGS else 'OpenAI'}")
+print(f"🔮 Embeddings: {'Local (' + Config.LOCAL_EMBEDDING_MODEL + ')' if Config.USE_LOCAL_EMBEDDINGS else 'Google AI Studio' if Config.USE_GOOGLE_EMBEDDINGS else 'OpenAI'}")
 print(f"📊 Using model: {Config.LLM_MODEL}")
 print(f"🔍 Will show {Config.FINAL_SUGGESTIONS} suggestions per query")
 print(f"🕷️ Scraper: {'Crawl4AI (AI-optimized)' if Config.USE_CRAWL4AI else 'BeautifulSoup (Traditional)'}")
@@ -2,32 +2,61 @@
 Embeddings module for generating and storing blog post embeddings using OpenAI and ChromaDB.
 """
 
+import asyncio
+import hashlib
 import os
 from typing import List, Dict, Optional
+
+import numpy as np
 from tqdm import tqdm
 
-from langchain_openai import OpenAIEmbeddings
-from langchain_google_genai import GoogleGenerativeAIEmbeddings
 from langchain_community.vectorstores import Chroma
 from langchain_core.documents import Document
 
 from config import Config
+from utils.models import Post
+from utils.simkernels import dot_i8
 
 
 class EmbeddingsManager:
     """Manages embedding generation and vector database operations."""
-    
+
     def __init__(self):
         """Initialize embeddings manager with Google AI or OpenAI and ChromaDB."""
-        
-        # Initialize embeddings based on config
-        if Config.USE_GOOGLE_EMBEDDINGS:
+
+        # Initialize embeddings based on config - only the selected provider's
+        # stack is imported, keeping cold start fast and baseline memory low
+        if Config.USE_LOCAL_EMBEDDINGS:
+            from langchain_community.embeddings import HuggingFaceEmbeddings
+
+            try:
+                import torch
+                device = "cuda" if torch.cuda.is_available() else "cpu"
+            except ImportError:
+                device = "cpu"
+
+            # Local model: no per-embed HTTP latency, no API cost; the build
+            # becomes compute-bound and batches straight through the encoder
+            self.embeddings = HuggingFaceEmbeddings(
+                model_name=Config.LOCAL_EMBEDDING_MODEL,
+                model_kwargs={"device": device},
+                encode_kwargs={
+                    "normalize_embeddings": True,
+                    "batch_size": Config.LOCAL_EMBEDDING_BATCH_SIZE
+                }
+            )
+            provider = f"Local ({device})"
+        elif Config.USE_GOOGLE_EMBEDDINGS:
+            from langchain_google_genai import GoogleGenerativeAIEmbeddings
+
             self.embeddings = GoogleGenerativeAIEmbeddings(
                 model=Config.EMBEDDING_MODEL,
                 google_api_key=Config.GOOGLE_API_KEY
             )
             provider = "Google AI Studio"
         else:
+            from langchain_openai import OpenAIEmbeddings
+
             self.embeddings = OpenAIEmbeddings(
                 model=Config.EMBEDDING_MODEL,
                 openai_api_key=Config.OPENAI_API_KEY
@@ -39,19 +68,36 @@ class EmbeddingsManager:
         
         # Initialize or load existing ChromaDB
         self.vectorstore = None
-        
+
+        # URL lookup index and similarity arrays (populated by
+        # _build_url_index once a vectorstore loads; empty until then so
+        # lookups against a manager with no database degrade to misses
+        # instead of AttributeErrors)
+        self.url_to_id = {}
+        self.url_to_embedding = {}
+        self.url_to_metadata = {}
+        self.url_to_index = {}
+        self.urls = []
+        self.ids = []
+        self.titles = []
+        self.excerpts = []
+        self.embedding_matrix = np.zeros((0, 0), dtype=np.float32)
+        self.quantized_matrix = np.zeros((0, 0), dtype=np.int8)
+        self.quant_scales = np.zeros(0, dtype=np.float32)
+        self.binary_codes = np.zeros((0, 0), dtype=np.uint8)
+
         print("✅ Embeddings manager initialized")
         print(f"   Provider: {provider}")
-        print(f"   Model: {Config.EMBEDDING_MODEL}")
+        print(f"   Model: {Config.LOCAL_EMBEDDING_MODEL if Config.USE_LOCAL_EMBEDDINGS else Config.EMBEDDING_MODEL}")
         print(f"   Storage: {Config.CHROMA_PERSIST_DIR}")
     
     
-    def create_documents(self, posts: List[Dict[str, str]]) -> List[Document]:
+    def create_documents(self, posts: List[Post]) -> List[Document]:
         """
         Convert scraped posts to LangChain Document objects.
         
         Args:
-            posts: List of dicts with 'url', 'title', 'content'
+            posts: List of scraped Post records
             
         Returns:
             List of Document objects ready for embedding
@@ -60,14 +106,17 @@ class EmbeddingsManager:
         
         for post in posts:
             # Combine title and content for embedding
-            text = f"{post['title']}\n\n{post['content']}"
+            text = f"{post.title}\n\n{post.content}"
             
             # Create Document with metadata
             doc = Document(
                 page_content=text,
                 metadata={
-                    'url': post['url'],
-                    'title': post['title'],
+                    'url': post.url,
+                    'title': post.title,
+                    # Pre-truncate the LLM prompt excerpt once at ingest so
+                    # query time does no slicing
+                    'excerpt': post.content[:Config.EXCERPT_LENGTH],
                     'source': 'blog_post'
                 }
             )
@@ -76,7 +125,7 @@ class EmbeddingsManager:
         print(f"📄 Created {len(documents)} documents")
         return documents
     
-    def build_vectorstore(self, posts: List[Dict[str, str]], show_progress: bool = True) -> Chroma:
+    def build_vectorstore(self, posts: List[Post], show_progress: bool = True) -> Chroma:
         """
         Build vector database from blog posts using COSINE similarity.
         
@@ -90,49 +139,221 @@ class EmbeddingsManager:
         print(f"\n🔮 Building vector database...")
         print(f"   Posts to embed: {len(posts)}")
         print(f"   Distance metric: COSINE (best for text embeddings)")
-        
-        # Convert to documents
-        documents = self.create_documents(posts)
-        
+
         # Generate embeddings and store in ChromaDB
         print("   Generating embeddings (this may take a few minutes)...")
-        
-        if show_progress:
-            # Process with progress bar
-            batch_size = 10
-            
-            with tqdm(total=len(documents), desc="Embedding posts") as pbar:
-                for i in range(0, len(documents), batch_size):
-                    batch = documents[i:i + batch_size]
-                    
-                    if self.vectorstore is None:
-                        # Create new vectorstore with COSINE metric
-                        self.vectorstore = Chroma.from_documents(
-                            documents=batch,
-                            embedding=self.embeddings,
-                            persist_directory=Config.CHROMA_PERSIST_DIR,
-                            collection_name=Config.COLLECTION_NAME,
-                            collection_metadata={"hnsw:space": "cosine"}  # ⬅️ FIX: Use cosine!
-                        )
-                    else:
-                        # Add to existing vectorstore
-                        self.vectorstore.add_documents(batch)
-                    
-                    pbar.update(len(batch))
-        else:
-            # Process all at once
-            self.vectorstore = Chroma.from_documents(
-                documents=documents,
-                embedding=self.embeddings,
-                persist_directory=Config.CHROMA_PERSIST_DIR,
-                collection_name=Config.COLLECTION_NAME,
-                collection_metadata={"hnsw:space": "cosine"}  # ⬅️ FIX: Use cosine!
+
+        # Both Google and OpenAI embedding APIs accept up to 100 inputs per
+        # request, so embed in batches of 100 and write to the collection
+        # directly instead of going through LangChain's per-document wrapper
+        batch_size = 100
+
+        # Create or open vectorstore with COSINE metric
+        self.vectorstore = Chroma(
+            persist_directory=Config.CHROMA_PERSIST_DIR,
+            embedding_function=self.embeddings,
+            collection_name=Config.COLLECTION_NAME,
+            collection_metadata={"hnsw:space": "cosine"}  # ⬅️ FIX: Use cosine!
+        )
+
+        # Diff against what's already stored: a typical re-crawl changes only
+        # a handful of posts, so only those pay for an embedding call
+        new_hashes = {
+            post.url: hashlib.sha1(post.content.encode()).hexdigest()
+            for post in posts
+        }
+
+        existing_records = self.vectorstore._collection.get(include=['metadatas'])
+        existing_hashes = {
+            metadata.get('url'): metadata.get('content_sha1')
+            for metadata in existing_records['metadatas']
+        }
+
+        # Dedupe by URL while diffing: a sitemap with a repeated <loc> would
+        # otherwise produce duplicate ids in one upsert, which Chroma rejects
+        changed = []
+        seen_urls = set()
+        for post in posts:
+            if post.url in seen_urls:
+                continue
+            seen_urls.add(post.url)
+            if new_hashes[post.url] != existing_hashes.get(post.url):
+                changed.append(post)
+
+        # Drop posts that disappeared from the sitemap, plus any record not
+        # stored under sha1(url) - databases built before deterministic ids
+        # used random LangChain ids, and those rows re-ingest under the new
+        # id, so leaving the old one behind would duplicate the post
+        stale_ids = []
+        for doc_id, metadata in zip(
+            existing_records['ids'], existing_records['metadatas']
+        ):
+            url = metadata.get('url')
+            if (url not in new_hashes
+                    or doc_id != hashlib.sha1(url.encode()).hexdigest()):
+                stale_ids.append(doc_id)
+        if stale_ids:
+            self.vectorstore._collection.delete(ids=stale_ids)
+            print(f"🗑️ Removed {len(stale_ids)} stale or legacy-id records")
+
+        print(f"   Unchanged posts skipped: {len(posts) - len(changed)}")
+
+        if changed:
+            # Title and content are fused once here - no intermediate Document
+            # objects, so peak memory during the build stays at one copy of
+            # the corpus
+            texts = [post.title + "\n\n" + post.content for post in changed]
+            metadatas = [{
+                'url': post.url,
+                'title': post.title,
+                # Pre-truncate the LLM prompt excerpt once at ingest
+                'excerpt': post.content[:Config.EXCERPT_LENGTH],
+                'content_sha1': new_hashes[post.url],
+                'source': 'blog_post'
+            } for post in changed]
+            # Deterministic ids derived from the URL make re-ingests
+            # idempotent: the same post upserts in place instead of duplicating
+            ids = [hashlib.sha1(post.url.encode()).hexdigest() for post in changed]
+
+            # Fire embedding batches concurrently so the build is bound by the
+            # provider's rate limit rather than serial round-trip time
+            vectors = asyncio.run(self._embed_texts(texts, batch_size, show_progress))
+
+            # Persist as unit-normalized float32: half the bytes of float64
+            # with no accuracy loss for cosine search, and normalizing once at
+            # ingest means cosine similarity is just a dot product at query time
+            vectors = np.asarray(vectors, dtype=np.float32)
+            norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            vectors /= norms
+
+            # Upsert everything in one write (identical ids replace in place)
+            self.vectorstore._collection.upsert(
+                ids=ids,
+                embeddings=vectors.tolist(),
+                documents=texts,
+                metadatas=metadatas
             )
-        
-        print(f"✅ Vector database built with {len(documents)} posts")
+
+        print(f"✅ Vector database built with {len(posts)} posts ({len(changed)} embedded)")
+        self._build_url_index()
         return self.vectorstore
 
 
+    async def _embed_texts(self, texts: List[str], batch_size: int, show_progress: bool = True) -> List[List[float]]:
+        """
+        Embed texts in concurrent batches.
+
+        Args:
+            texts: Texts to embed
+            batch_size: Inputs per embedding request
+            show_progress: Show progress bar during embedding
+
+        Returns:
+            Embedding vectors in the same order as texts
+        """
+        semaphore = asyncio.Semaphore(Config.MAX_CONCURRENT_REQUESTS)
+        chunks = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+
+        with tqdm(total=len(texts), desc="Embedding posts", disable=not show_progress) as pbar:
+
+            async def embed_chunk(chunk):
+                async with semaphore:
+                    vectors = await self.embeddings.aembed_documents(chunk)
+                    pbar.update(len(chunk))
+                    return vectors
+
+            chunk_vectors = await asyncio.gather(*[embed_chunk(chunk) for chunk in chunks])
+
+        # Flatten back into one ordered list
+        return [vector for vectors in chunk_vectors for vector in vectors]
+
+
+    def _build_url_index(self):
+        """
+        Build the URL lookup index and the in-memory similarity arrays
+        from the collection. One bulk fetch at load time replaces the
+        O(N) full-collection scan that used to run on every search.
+
+        The whole corpus fits comfortably in RAM, so similarity search
+        runs against a normalized float32 matrix (one vectorized dot
+        product) and Chroma is only used for persistence.
+
+        Only embeddings and metadatas are fetched - the full document
+        bodies stay on disk and are read one at a time via get_document,
+        which keeps the resident index a fraction of the corpus size.
+        """
+        all_records = self.vectorstore._collection.get(
+            include=['embeddings', 'metadatas']
+        )
+
+        self.url_to_id = {}
+        self.url_to_embedding = {}
+        self.url_to_metadata = {}
+
+        # Parallel arrays aligned with the embedding matrix rows
+        self.url_to_index = {}
+        self.urls = []
+        self.ids = []
+        self.titles = []
+        self.excerpts = []
+
+        for row, (doc_id, embedding, metadata) in enumerate(zip(
+            all_records['ids'], all_records['embeddings'],
+            all_records['metadatas']
+        )):
+            url = metadata.get('url')
+            if url:
+                self.url_to_id[url] = doc_id
+                self.url_to_embedding[url] = embedding
+                self.url_to_metadata[url] = metadata
+                self.url_to_index[url] = row
+
+            self.urls.append(url)
+            self.ids.append(doc_id)
+            self.titles.append(metadata.get('title'))
+            # Ingest always stores an excerpt; '' covers databases built
+            # before it was added (rebuild to restore excerpts for those)
+            self.excerpts.append(metadata.get('excerpt') or '')
+
+        # Normalized float32 matrix: cosine similarity becomes a dot product.
+        # Kept C-contiguous so the (N, D) @ (D,) scan compiles down to one
+        # BLAS sgemv call with SIMD from the underlying library
+        matrix = np.ascontiguousarray(
+            np.asarray(all_records['embeddings'], dtype=np.float32)
+        )
+        if matrix.size:
+            norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            matrix /= norms
+        self.embedding_matrix = matrix
+
+        # Symmetric per-vector int8 quantization: the first-pass scan reads a
+        # quarter of the bytes, and an exact float32 rerank on the oversampled
+        # candidates recovers full precision
+        if matrix.size:
+            absmax = np.max(np.abs(matrix), axis=1, keepdims=True)
+            scales = absmax / 127.0
+            scales[scales == 0] = 1.0
+            self.quantized_matrix = np.clip(
+                np.round(matrix / scales), -128, 127
+            ).astype(np.int8)
+            self.quant_scales = scales.astype(np.float32).ravel()
+        else:
+            self.quantized_matrix = np.zeros((0, 0), dtype=np.int8)
+            self.quant_scales = np.zeros(0, dtype=np.float32)
+
+        # 1-bit sign codes (packed, 32x smaller than float32): Hamming
+        # distance over these preserves cosine ordering well enough to
+        # shortlist candidates for the quantized and exact passes
+        if matrix.size:
+            self.binary_codes = np.packbits(matrix > 0, axis=1)
+        else:
+            self.binary_codes = np.zeros((0, 0), dtype=np.uint8)
+
+        print(f"🗂️ Indexed {len(self.url_to_id)} URLs for direct lookup")
+
+
     def load_vectorstore(self) -> Optional[Chroma]:
         """
         Load existing vector database from disk with COSINE metric.
@@ -154,6 +375,7 @@ class EmbeddingsManager:
             if count > 0:
                 print(f"✅ Loaded existing vector database ({count} posts)")
                 print(f"   Distance metric: COSINE")
+                self._build_url_index()
                 return self.vectorstore
             else:
                 print("⚠️ Vector database exists but is empty")
@@ -164,7 +386,7 @@ class EmbeddingsManager:
             return None
 
     
-    def get_or_create_vectorstore(self, posts: List[Dict[str, str]] = None) -> Chroma:
+    def get_or_create_vectorstore(self, posts: List[Post] = None) -> Chroma:
         """
         Load existing vectorstore or create new one if doesn't exist.
         
@@ -188,7 +410,7 @@ class EmbeddingsManager:
         raise ValueError("No existing vectorstore found and no posts provided to create one")
     
     
-    def add_posts(self, new_posts: List[Dict[str, str]]):
+    def add_posts(self, new_posts: List[Post]):
         """
         Add new blog posts to existing vector database.
         
@@ -203,15 +425,97 @@ class EmbeddingsManager:
         print(f"\n➕ Adding {len(new_posts)} new posts to vector database...")
         
         documents = self.create_documents(new_posts)
-        self.vectorstore.add_documents(documents)
-        
+        ids = [hashlib.sha1(post.url.encode()).hexdigest() for post in new_posts]
+        self.vectorstore.add_documents(documents, ids=ids)
+        self._build_url_index()
+
         print(f"✅ Added {len(new_posts)} posts to database")
     
     
+    def get_metadata(self, url: str) -> Optional[Dict]:
+        """
+        Look up the cached metadata for a blog post URL.
+
+        Args:
+            url: URL of the post
+
+        Returns:
+            Metadata dict from the index, or None if the URL is unknown
+        """
+        return self.url_to_metadata.get(url)
+
+
+    def get_document(self, url: str) -> Optional[str]:
+        """
+        Fetch the full text of a single blog post from the collection.
+
+        The URL index keeps only the (url -> document id) map in RAM;
+        the body itself is read from Chroma on demand, one record at a
+        time, instead of holding the whole corpus text resident.
+
+        Args:
+            url: URL of the post
+
+        Returns:
+            The stored document text, or None if the URL is unknown
+        """
+        doc_id = self.url_to_id.get(url)
+        if doc_id is None:
+            return None
+
+        record = self.vectorstore._collection.get(ids=[doc_id], include=['documents'])
+        documents = record.get('documents') or []
+        return documents[0] if documents else None
+
+
+    def _mmr_select(self, candidate_rows: np.ndarray, sims: np.ndarray, k: int) -> List[int]:
+        """
+        Re-rank candidates with Maximal Marginal Relevance.
+
+        Iteratively picks the candidate maximizing
+        lambda * sim_to_query - (1 - lambda) * max_sim_to_selected,
+        so near-duplicate posts don't crowd out diverse suggestions.
+        Reuses the normalized embedding matrix - no extra embedding calls.
+
+        Args:
+            candidate_rows: Matrix rows of the candidate pool, best-first
+            sims: Cosine similarities of every row to the query post
+            k: Number of rows to select
+
+        Returns:
+            Selected matrix rows in ranked order
+        """
+        lamb = Config.MMR_LAMBDA
+        remaining = [int(row) for row in candidate_rows]
+        selected = []
+
+        while remaining and len(selected) < k:
+            if not selected:
+                # Candidates arrive best-first, so the first pick is the
+                # most relevant one
+                best = remaining[0]
+            else:
+                candidate_embs = self.embedding_matrix[remaining]
+                selected_embs = self.embedding_matrix[selected]
+
+                # Penalize similarity to anything already selected
+                redundancy = (candidate_embs @ selected_embs.T).max(axis=1)
+                scores = lamb * sims[remaining] - (1 - lamb) * redundancy
+                best = remaining[int(np.argmax(scores))]
+
+            selected.append(best)
+            remaining.remove(best)
+
+        return selected
+
+
     def search_similar(self, query_url: str, k: int = None) -> List[Dict]:
         """
         Find similar blog posts using COSINE similarity.
-        
+
+        The query post's embedding is read from the index built at load
+        time, so no embedding API call is made at query time.
+
         Args:
             query_url: URL of the blog post to find similar posts for
             k: Number of similar posts to return
@@ -224,55 +528,91 @@ class EmbeddingsManager:
         
         if not self.vectorstore:
             raise ValueError("Vectorstore not initialized. Load or create one first.")
-        
-        # Get all documents to find the query post
-        all_docs = self.vectorstore.get()
-        
-        # Find the query post
-        query_doc = None
-        for i, url in enumerate(all_docs['metadatas']):
-            if url.get('url') == query_url:
-                query_doc = all_docs['documents'][i]
-                break
-        
-        if not query_doc:
+
+        # Look up the query post's matrix row (O(1) dict lookup - no
+        # full-collection scan, no re-embedding API call)
+        query_idx = self.url_to_index.get(query_url)
+
+        if query_idx is None:
             raise ValueError(f"URL not found in database: {query_url}")
-        
-        # Search for similar documents
-        results = self.vectorstore.similarity_search_with_score(
-            query_doc,
-            k=k + 1  # +1 because query post will be in results
+
+        pool_size = max(k, Config.TOP_K_RESULTS)
+        corpus_size = len(self.embedding_matrix)
+
+        # Stage 1: Hamming prefilter on the packed sign codes - the scan
+        # touches 1 bit per dimension instead of 32
+        query_bits = self.binary_codes[query_idx]
+        hamming = np.unpackbits(self.binary_codes ^ query_bits, axis=1).sum(axis=1)
+
+        m1 = min(corpus_size - 1, 10 * pool_size)
+        prefilter = np.argpartition(hamming, m1)[:m1 + 1]
+
+        # Stage 2: approximate cosine from the int8 codes of the shortlist
+        # (native int8 kernel when numba is installed, NumPy otherwise)
+        approx = dot_i8(
+            self.quantized_matrix[query_idx],
+            np.ascontiguousarray(self.quantized_matrix[prefilter]),
+            self.quant_scales[query_idx],
+            self.quant_scales[prefilter]
         )
-        
-        # Filter out the query post itself and format results
-        similar_posts = []
-        for doc, score in results:
-            # Skip if it's the query post itself
-            if doc.metadata.get('url') == query_url:
-                continue
-            
-            # With COSINE: score is already cosine distance (0 = identical, 2 = opposite)
-            # Convert to similarity: similarity = 1 - (distance / 2)
-            # This gives us a 0-1 scale where 1 = identical
-            similarity = 1 - (score / 2)
-            
-            # Apply threshold
-            if similarity >= Config.MIN_SIMILARITY_THRESHOLD:
-                similar_posts.append({
-                    'url': doc.metadata.get('url'),
-                    'title': doc.metadata.get('title'),
-                    'content': doc.page_content,
-                    'similarity': similarity
-                })
-        
-        # Sort by similarity (highest first) and limit to k results
-        similar_posts.sort(key=lambda x: x['similarity'], reverse=True)
-        
-        return similar_posts[:k]
+
+        # Keep an oversampled candidate set for the exact rerank
+        kth = min(len(approx) - 1, Config.QUANT_OVERSAMPLE * pool_size)
+        candidates_approx = prefilter[np.argpartition(-approx, kth)[:kth + 1]]
+
+        # Stage 3: exact float32 cosine on the candidates only; everything
+        # else stays at -inf so non-candidates can never clear a threshold,
+        # even a threshold of 0 (whose cosine cutoff is exactly -1)
+        sims = np.full(corpus_size, -np.inf, dtype=np.float32)
+        sims[candidates_approx] = (
+            self.embedding_matrix[candidates_approx] @ self.embedding_matrix[query_idx]
+        )
+
+        # Apply the threshold as a boolean mask in cosine space before any
+        # ranking work; the reported 0-1 score is (1 + cos) / 2, so the
+        # cutoff maps back to cosine as 2 * threshold - 1
+        threshold_cos = 2 * Config.MIN_SIMILARITY_THRESHOLD - 1
+        mask = sims >= threshold_cos
+        mask[query_idx] = False  # Exclude the query post itself
+        candidates = np.nonzero(mask)[0]
+
+        # Exclude by URL as well as row: a duplicate record for the query
+        # post (e.g. one written under a legacy id) scores cos ~= 1.0 and
+        # would otherwise come back as its own top suggestion
+        candidates = candidates[
+            [self.urls[row] != query_url for row in candidates]
+        ]
+
+        # Sort only the survivors (usually far fewer than the corpus), then
+        # re-rank the wider candidate pool down to k with MMR so the final
+        # suggestions balance relevance with diversity
+        pool = candidates[np.argsort(-sims[candidates])][:pool_size]
+        top = self._mmr_select(pool, sims, k)
+
+        # Nothing above the threshold is a normal outcome, and Chroma
+        # rejects get(ids=[]) - return early instead
+        if not top:
+            return []
+
+        # Fetch the k winning documents in one read - only these few bodies
+        # ever leave disk, not the whole corpus
+        top_ids = [self.ids[row] for row in top]
+        fetched = self.vectorstore._collection.get(ids=top_ids, include=['documents'])
+        id_to_document = dict(zip(fetched['ids'], fetched['documents']))
+
+        # Map cosine similarity [-1, 1] to a 0-1 scale where 1 = identical
+        # (equivalent to the old 1 - distance/2 conversion)
+        return [{
+            'url': self.urls[row],
+            'title': self.titles[row],
+            'content': id_to_document.get(self.ids[row]),
+            'excerpt': self.excerpts[row],
+            'similarity': (1 + float(sims[row])) / 2
+        } for row in top]
 
 
 
-def initialize_database(posts: List[Dict[str, str]] = None, force_rebuild: bool = False) -> EmbeddingsManager:
+def initialize_database(posts: List[Post] = None, force_rebuild: bool = False) -> EmbeddingsManager:
     """
     Initialize or load the embeddings database.
     
@@ -2,155 +2,182 @@
 LLM processor for generating link reasons and anchor text using GPT-4o.
 """
 
-from typing import Dict, List
-from langchain_openai import ChatOpenAI
+import asyncio
+import json
+import time
+from typing import Dict, List, Tuple
 from langchain_core.prompts import PromptTemplate
+from langchain_core.rate_limiters import InMemoryRateLimiter
 from config import Config
 
 
 class LLMProcessor:
     """Generates reasons and anchor text for internal links using GPT-4o."""
-    
+
     def __init__(self):
         """Initialize LLM processor with GPT-4o."""
+        # Deferred import: the OpenAI stack only loads when a processor is
+        # actually constructed
+        from langchain_openai import ChatOpenAI
+
+        # Token-bucket limiter smooths request submission so concurrent
+        # batches don't trip OpenAI RPM limits and sit in retry backoff
+        rate_limiter = InMemoryRateLimiter(
+            requests_per_second=Config.LLM_REQUESTS_PER_MINUTE / 60,
+            check_every_n_seconds=0.05
+        )
+
         self.llm = ChatOpenAI(
             model=Config.LLM_MODEL,
             temperature=0.7,  # Balanced creativity
-            openai_api_key=Config.OPENAI_API_KEY
+            openai_api_key=Config.OPENAI_API_KEY,
+            model_kwargs={"response_format": {"type": "json_object"}},
+            rate_limiter=rate_limiter
         )
-        
-        # Create prompt templates
-        self.reason_prompt = PromptTemplate.from_template(Config.REASON_PROMPT_TEMPLATE)
-        self.anchor_prompt = PromptTemplate.from_template(Config.ANCHOR_TEXT_PROMPT_TEMPLATE)
+
+        # Create prompt template (one call returns both reason and anchor text)
+        self.suggestion_prompt = PromptTemplate.from_template(Config.LINK_SUGGESTION_PROMPT_TEMPLATE)
+
+        # Results cache keyed by (from_url, to_url) - users re-query the same
+        # source URL often, and identical pairs should not re-hit the API
+        self._suggestion_cache = {}
+        self._cache_ttl = Config.CACHE_EXPIRY_DAYS * 86400
+
         print("🤖 LLM Processor initialized")
         print(f"   Model: {Config.LLM_MODEL}")
-    
-    
-    def generate_reason(self, target_title: str, target_excerpt: str, 
-                       similar_title: str, similar_excerpt: str) -> str:
+
+
+    async def _invoke_suggestion(self, target_title: str, target_excerpt: str,
+                                 similar_title: str, similar_excerpt: str) -> Tuple[str, str]:
         """
-        Generate a reason for why two posts should be linked.
-        
+        Generate the reason and anchor text for one link in a single call.
+
         Args:
             target_title: Title of the main post
             target_excerpt: Excerpt from the main post
             similar_title: Title of the similar post
             similar_excerpt: Excerpt from the similar post
-            
+
         Returns:
-            One-sentence explanation of why posts should be linked
+            Tuple of (reason, anchor_text)
         """
         try:
-            # Format the prompt
-            formatted_prompt = self.reason_prompt.format(
+            formatted_prompt = self.suggestion_prompt.format(
                 target_title=target_title,
                 target_excerpt=target_excerpt,
                 similar_title=similar_title,
                 similar_excerpt=similar_excerpt
             )
-            
-            # Get response from GPT-4o
-            response = self.llm.invoke(formatted_prompt)
-            reason = response.content.strip()
-            
-            return reason
-            
+
+            # Get JSON response from GPT-4o
+            response = await self.llm.ainvoke(formatted_prompt)
+            parsed = json.loads(response.content)
+
+            reason = str(parsed.get('reason', '')).strip()
+            anchor_text = str(parsed.get('anchor_text', '')).strip().strip('"').strip("'")
+
+            if not reason:
+                reason = "These posts cover related topics and would benefit from internal linking."
+            if not anchor_text:
+                anchor_text = similar_title
+
+            return reason, anchor_text
+
         except Exception as e:
-            print(f"⚠️ Error generating reason: {e}")
-            return "These posts cover related topics and would benefit from internal linking."
-    
-    
-    def generate_anchor_text(self, target_context: str, similar_title: str) -> str:
+            print(f"⚠️ Error generating suggestion: {e}")
+            # Fallback to safe defaults
+            return (
+                "These posts cover related topics and would benefit from internal linking.",
+                similar_title
+            )
+
+
+    async def _process_one(self, target_post: Dict, target_excerpt: str,
+                           similar_post: Dict, semaphore: asyncio.Semaphore) -> Dict:
         """
-        Generate natural anchor text for linking.
-        
+        Process a single similar post to generate reason and anchor text.
+
         Args:
-            target_context: Context from the target post
-            similar_title: Title of the post to link to
-            
+            target_post: Dict with 'title' and 'content'
+            target_excerpt: Pre-computed excerpt of the target post
+            similar_post: Dict with 'title', 'excerpt', 'url', 'similarity'
+            semaphore: Concurrency guard to respect API rate limits
+
         Returns:
-            Natural anchor text phrase (3-7 words)
+            Enhanced dict with 'reason' and 'anchor_text' added
         """
-        try:
-            # Format the prompt
-            formatted_prompt = self.anchor_prompt.format(
-                target_context=target_context,
-                similar_title=similar_title
-            )
-            
-            # Get response from GPT-4o
-            response = self.llm.invoke(formatted_prompt)
-            anchor_text = response.content.strip()
-            
-            # Clean up quotes if present
-            anchor_text = anchor_text.strip('"').strip("'")
-            
-            return anchor_text
-            
-        except Exception as e:
-            print(f"⚠️ Error generating anchor text: {e}")
-            # Fallback to simple anchor text
-            return similar_title
-    
-    
+        cache_key = (target_post.get('url', ''), similar_post.get('url', ''))
+        cached = self._suggestion_cache.get(cache_key)
+
+        if cached and time.monotonic() - cached[0] < self._cache_ttl:
+            # Identical (from, to) pair already processed - skip the API
+            reason, anchor_text = cached[1], cached[2]
+        else:
+            async with semaphore:
+                reason, anchor_text = await self._invoke_suggestion(
+                    target_title=target_post.get('title', ''),
+                    target_excerpt=target_excerpt,
+                    similar_title=similar_post.get('title', ''),
+                    # Excerpt is pre-truncated at ingest - no slicing here
+                    similar_excerpt=similar_post.get('excerpt', '')
+                )
+            self._suggestion_cache[cache_key] = (time.monotonic(), reason, anchor_text)
+
+        # Add to result
+        result = similar_post.copy()
+        result['reason'] = reason
+        result['anchor_text'] = anchor_text
+
+        return result
+
+
     def process_similar_post(self, target_post: Dict, similar_post: Dict) -> Dict:
         """
         Process a similar post to generate reason and anchor text.
-        
+
         Args:
             target_post: Dict with 'title' and 'content'
             similar_post: Dict with 'title', 'content', 'url', 'similarity'
-            
+
         Returns:
             Enhanced dict with 'reason' and 'anchor_text' added
         """
-        # Get excerpts (first 300 chars)
-        target_excerpt = target_post.get('content', '')[:300]
-        similar_excerpt = similar_post.get('content', '')[:300]
-        
-        # Generate reason
-        reason = self.generate_reason(
-            target_title=target_post.get('title', ''),
-            target_excerpt=target_excerpt,
-            similar_title=similar_post.get('title', ''),
-            similar_excerpt=similar_excerpt
-        )
-        
-        # Generate anchor text
-        anchor_text = self.generate_anchor_text(
-            target_context=target_excerpt,
-            similar_title=similar_post.get('title', '')
-        )
-        
-        # Add to result
-        result = similar_post.copy()
-        result['reason'] = reason
-        result['anchor_text'] = anchor_text
-        
-        return result
-    
-    
+        semaphore = asyncio.Semaphore(Config.MAX_CONCURRENT_REQUESTS)
+        target_excerpt = target_post.get('content', '')[:Config.EXCERPT_LENGTH]
+        return asyncio.run(self._process_one(target_post, target_excerpt, similar_post, semaphore))
+
+
+    async def _process_all(self, target_post: Dict, similar_posts: List[Dict]) -> List[Dict]:
+        """Run all suggestions through the LLM concurrently."""
+        semaphore = asyncio.Semaphore(Config.MAX_CONCURRENT_REQUESTS)
+
+        # Compute the target excerpt once per query, not once per suggestion
+        target_excerpt = target_post.get('content', '')[:Config.EXCERPT_LENGTH]
+
+        tasks = [
+            self._process_one(target_post, target_excerpt, similar_post, semaphore)
+            for similar_post in similar_posts
+        ]
+        return await asyncio.gather(*tasks)
+
+
     def process_all_suggestions(self, target_post: Dict, similar_posts: List[Dict]) -> List[Dict]:
         """
         Process all similar posts to add reasons and anchor text.
-        
+        All LLM calls run concurrently, so wall time is bounded by the
+        slowest single call rather than the sum of all of them.
+
         Args:
             target_post: The main blog post
             similar_posts: List of similar posts from similarity search
-            
+
         Returns:
             Enhanced list with reasons and anchor text for each suggestion
         """
         print(f"\n🤖 Generating reasons and anchor text for {len(similar_posts)} suggestions...")
-        
-        enhanced_results = []
-        
-        for i, similar_post in enumerate(similar_posts, 1):
-            print(f"   Processing {i}/{len(similar_posts)}: {similar_post.get('title', 'Unknown')[:50]}...")
-            
-            enhanced = self.process_similar_post(target_post, similar_post)
-            enhanced_results.append(enhanced)
-        
+
+        enhanced_results = asyncio.run(self._process_all(target_post, similar_posts))
+
         print("✅ All suggestions processed")
         return enhanced_results
 
@@ -158,7 +185,7 @@ class LLMProcessor:
 def create_llm_processor() -> LLMProcessor:
     """
     Factory function to create an LLM processor.
-    
+
     Returns:
         LLMProcessor instance
     """
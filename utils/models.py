@@ -0,0 +1,21 @@
+"""
+Shared record types for the scrape -> embed pipeline.
+"""
+
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class Post:
+    """
+    One scraped blog post. Slots avoid the ~200 bytes of per-record dict
+    overhead a plain {'url', 'title', 'content'} dict would carry.
+    Declared by hand rather than dataclass(slots=True), which needs
+    Python 3.10+ while the project supports 3.8.
+    """
+
+    __slots__ = ('url', 'title', 'content')
+
+    url: str
+    title: str
+    content: str
@@ -78,17 +78,16 @@ class SimilaritySearcher:
             Text snippet from the post
         """
         try:
-            # Get the document from vectorstore
-            all_docs = self.embeddings_manager.vectorstore.get()
-            
-            for i, metadata in enumerate(all_docs['metadatas']):
-                if metadata.get('url') == url:
-                    content = all_docs['documents'][i]
-                    # Return first max_chars characters
-                    return content[:max_chars] + "..." if len(content) > max_chars else content
-            
-            return None
-            
+            # Single-record fetch keyed by the URL index - the corpus text
+            # stays on disk, only this one body is read
+            content = self.embeddings_manager.get_document(url)
+
+            if content is None:
+                return None
+
+            # Return first max_chars characters
+            return content[:max_chars] + "..." if len(content) > max_chars else content
+
         except Exception as e:
             print(f"⚠️ Could not get context for {url}: {e}")
             return None
@@ -104,18 +103,8 @@ class SimilaritySearcher:
         Returns:
             True if URL exists in database
         """
-        try:
-            all_docs = self.embeddings_manager.vectorstore.get()
-            
-            for metadata in all_docs['metadatas']:
-                if metadata.get('url') == url:
-                    return True
-            
-            return False
-            
-        except Exception as e:
-            print(f"⚠️ Error validating URL: {e}")
-            return False
+        # O(1) membership check against the URL index
+        return url in self.embeddings_manager.url_to_index
     
     
     def get_all_urls(self) -> List[str]:
@@ -125,14 +114,15 @@ class SimilaritySearcher:
         Returns:
             List of all blog post URLs
         """
-        try:
-            all_docs = self.embeddings_manager.vectorstore.get()
-            urls = [metadata.get('url') for metadata in all_docs['metadatas']]
-            return [url for url in urls if url]  # Filter out None values
-            
-        except Exception as e:
-            print(f"⚠️ Error getting URLs: {e}")
-            return []
+        # The index only holds non-None URLs, so this is the full list
+        return list(self.embeddings_manager.url_to_index)
+
+
+    def invalidate_cache(self):
+        """
+        Rebuild the underlying URL index after new posts are ingested.
+        """
+        self.embeddings_manager._build_url_index()
 
 
 def create_searcher(embeddings_manager: EmbeddingsManager) -> SimilaritySearcher: